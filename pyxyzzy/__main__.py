@@ -1,7 +1,7 @@
 import logging
 import sys
 from argparse import ArgumentParser
-from asyncio import get_event_loop
+from asyncio import new_event_loop, set_event_loop
 from signal import SIGTERM, SIGINT
 
 from pyxyzzy import APP_NAME, MODULE_NAME, config
@@ -23,7 +23,17 @@ if config.debug:
     logging.getLogger("websockets").setLevel(logging.INFO)
     logging.getLogger("peewee").setLevel(logging.INFO)
 
-loop = get_event_loop()
+# use uvloop if it's available, it's considerably faster than the default loop but doesn't support Windows
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    uvloop.install()
+
+# create the loop explicitly, as uvloop's policy doesn't create one in get_event_loop()
+loop = new_event_loop()
+set_event_loop(loop)
 stop_server = loop.create_future()
 
 try:
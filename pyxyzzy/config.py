@@ -9,8 +9,9 @@ from __future__ import annotations
 
 import re
 from dataclasses import field
+from functools import lru_cache
 from random import normalvariate
-from typing import Sequence, Optional
+from typing import Sequence, Optional, Tuple, Pattern
 
 import toml
 
@@ -30,9 +31,21 @@ def _validate_blacklist_syntax(blacklist: Sequence[str]):
             raise ConfigError(None, f"%s item {i + 1} is not a valid regex")
 
 
+@lru_cache(maxsize=None)
+def _compile_blacklist(blacklist: Tuple[str, ...]) -> Tuple[Pattern, ...]:
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in blacklist)
+
+
 def _validate_against_blacklist(string: str, blacklist: Sequence[str]):
     """Validates a string against a regex blacklist."""
-    return not any(re.search(pattern, string, re.IGNORECASE) for pattern in blacklist)
+    if not blacklist:
+        return True
+    return not any(pattern.search(string) for pattern in _compile_blacklist(tuple(blacklist)))
+
+
+@lru_cache(maxsize=None)
+def _compile_bad_name_regex(characters: str) -> Pattern:
+    return re.compile(r"^ | {2}| $|[^" + characters + r"]")
 
 
 class IntLimits(ParseableConfigObject):
@@ -100,6 +113,8 @@ class BotConfig(ParseableConfigObject):
 class ServerConfig(ParseableConfigObject):
     host: str
     port: int = conf_field(min=1, max=65535)
+    max_message_size: int = conf_field(min=1024)
+    compression: bool
 
 
 class DatabaseConfig(ParseableConfigObject):
@@ -208,8 +223,7 @@ class UsernameConfig(ParseableConfigObject):
         if len(username) not in self.length.as_range():
             return False
         # TODO: check for bad unicode characters
-        bad_regex = r"^ | {2}| $|[^" + self.characters + r"]"
-        if re.search(bad_regex, username):
+        if _compile_bad_name_regex(self.characters).search(username):
             return False
         return _validate_against_blacklist(username, self.blacklist)
 
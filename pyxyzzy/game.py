@@ -2,19 +2,22 @@ from __future__ import annotations
 
 from asyncio import get_event_loop, Handle
 from base64 import b64encode
+from collections import defaultdict
 from dataclasses import dataclass, field
-from enum import Enum, auto
-from hashlib import md5
+from enum import Enum, IntFlag, auto
 from os import urandom
-from random import shuffle, choice
-from typing import (TypeVar, Tuple, Optional, FrozenSet, Generic, List, Set, Sequence, Dict, Iterable, TYPE_CHECKING,
-                    NewType)
+from random import shuffle, randrange
+from sys import intern
+from typing import (TypeVar, Tuple, Optional, Generic, List, Sequence, Dict, Iterable, TYPE_CHECKING,
+                    NewType, Set)
 from uuid import UUID, uuid4
 
+import orjson
+
 from pyxyzzy.config import config
 from pyxyzzy.database import DbCardPack, DbWhiteCard, DbBlackCard, db_connection
 from pyxyzzy.exceptions import InvalidGameState
-from pyxyzzy.utils import CallbackTimer, single, generate_code, create_task_log_errors
+from pyxyzzy.utils import CallbackTimer, generate_code, create_task_log_errors, dataclass_slots
 from pyxyzzy.utils.config import ConfigObject
 from pyxyzzy.utils.searchablelist import SearchableList, IndexType
 
@@ -45,41 +48,79 @@ class GameState(Enum):
     game_ended = auto()
 
 
-class UpdateType(Enum):
+class UpdateType(IntFlag):
     game = auto()
     players = auto()
     hand = auto()
     options = auto()
 
 
-@dataclass(frozen=True)
+# pending updates are stored as plain ints, as IntFlag operators run in Python and are much slower
+_UPDATE_GAME = UpdateType.game.value
+_UPDATE_PLAYERS = UpdateType.players.value
+_UPDATE_HAND = UpdateType.hand.value
+_UPDATE_OPTIONS = UpdateType.options.value
+_UPDATE_ALL = _UPDATE_GAME | _UPDATE_PLAYERS | _UPDATE_HAND | _UPDATE_OPTIONS
+
+
+@dataclass_slots
+@dataclass
 class BlackCard:
+    """A black card contains a question or a fill-in-the-blank statement.
+
+    Black cards are immutable by convention. They are not frozen, as frozen dataclasses are slower to construct.
+    """
     text: str
     pick_count: int
     draw_count: int
     pack_name: Optional[str] = None
+    # cached result of to_json(), unset until first needed
+    _json: dict = field(init=False, repr=False, compare=False)
 
-    def to_json(self) -> dict:
-        return {
-            "text": self.text,
-            "pick_count": self.pick_count,
-            "draw_count": self.draw_count,
-            "pack_name": self.pack_name,
-        }
-
+    def __hash__(self):
+        return hash(self.text)
 
-@dataclass(frozen=True)
+    def to_json(self) -> dict:
+        """Convert this card to JSON. The result is cached and must not be modified."""
+        try:
+            return self._json
+        except AttributeError:
+            self._json = {
+                "text": self.text,
+                "pick_count": self.pick_count,
+                "draw_count": self.draw_count,
+                "pack_name": self.pack_name,
+            }
+            return self._json
+
+
+@dataclass_slots
+@dataclass
 class WhiteCard:
     """A white card contains an answer to a black card.
 
     ``slot_id`` does not uniquely identify a white card; instead, it uniquely identifies a "physical card". This makes
     a difference for blank cards, where the card can be written onto while keeping the same ``slot_id``. For non-blank
     cards, ``slot_id`` is unique inside a deck.
+
+    White cards are immutable by convention; ``write_blank()`` returns a new card. They are not frozen, as frozen
+    dataclasses are slower to construct.
     """
     slot_id: WhiteCardID
     text: Optional[str]
     blank: bool = False
     pack_name: Optional[str] = None
+    slot_id_str: str = field(init=False, repr=False, compare=False)
+    # cached result of to_json(), unset until first needed
+    _json: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # cache the string form of the ID, as it is needed for every JSON conversion
+        self.slot_id_str = str(self.slot_id)
+
+    def __hash__(self):
+        # equivalent to hash(self.slot_id), but skips the Python-level UUID.__hash__
+        return hash(self.slot_id.int)
 
     @classmethod
     def new_blank(cls) -> WhiteCard:
@@ -91,24 +132,35 @@ class WhiteCard:
         return WhiteCard(self.slot_id, text, True)
 
     def to_json(self) -> dict:
-        return {
-            "id": str(self.slot_id),
-            "text": self.text,
-            "blank": self.blank,
-            "pack_name": self.pack_name,
-        }
-
-
+        """Convert this card to JSON. The result is cached and must not be modified."""
+        try:
+            return self._json
+        except AttributeError:
+            self._json = {
+                "id": self.slot_id_str,
+                "text": self.text,
+                "blank": self.blank,
+                "pack_name": self.pack_name,
+            }
+            return self._json
+
+
+@dataclass_slots
 @dataclass(frozen=True)
 class CardPack:
     id: CardPackID
     name: str
-    black_cards: FrozenSet[BlackCard]
-    white_cards: FrozenSet[WhiteCard]
+    black_cards: Tuple[BlackCard, ...]
+    white_cards: Tuple[WhiteCard, ...]
+    id_str: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # cache the string form of the ID, as it is needed for every JSON conversion
+        object.__setattr__(self, "id_str", str(self.id))
 
     def to_json(self):
         return {
-            "id": str(self.id),
+            "id": self.id_str,
             "name": self.name,
             "black_cards": len(self.black_cards),
             "white_cards": len(self.white_cards),
@@ -116,7 +168,7 @@ class CardPack:
 
 
 def _card_packs_json(packs: Sequence[CardPack]):
-    return [str(pack.id) for pack in packs]
+    return [pack.id_str for pack in packs]
 
 
 class GameOptions(ConfigObject):
@@ -131,27 +183,39 @@ class GameOptions(ConfigObject):
     password: str = config.game.password.make_options_field()
     card_packs: Tuple[CardPack] = field(default=(), metadata={"to_json": _card_packs_json})
 
-    updateable_ingame = ["game_title", "public", "password", "player_limit"]
+    updateable_ingame = frozenset(("game_title", "public", "password", "player_limit"))
 
 
 class User:
     id: UserID
+    id_str: str
+    id_int: int
     token: str
     name: str
+    # used for case-insensitive name lookups
+    name_lower: str
     server: GameServer
-    game: Optional[Game] = None
-    player: Optional[Player] = None
+    game: Optional[Game]
+    player: Optional[Player]
 
     connection: Optional[GameConnection]
     # TODO: do we need a different timer for kick and user delete? probably not
     _disconnect_kick_timer: CallbackTimer
     _disconnect_remove_timer: CallbackTimer
 
+    __slots__ = ("id", "id_str", "id_int", "token", "name", "name_lower", "server", "game", "player", "connection",
+                 "_disconnect_kick_timer", "_disconnect_remove_timer")
+
     def __init__(self, name: str, server: GameServer, connection: GameConnection):
         self.id = UserID(uuid4())
+        self.id_str = str(self.id)
+        self.id_int = self.id.int
         self.token = b64encode(urandom(24)).decode("ascii")
         self.name = name
+        self.name_lower = name.lower()
         self.server = server
+        self.game = None
+        self.player = None
         self.connection = connection
         self._disconnect_kick_timer = CallbackTimer()
         self._disconnect_remove_timer = CallbackTimer()
@@ -205,7 +269,15 @@ class User:
 
     def send_message(self, message: dict):
         if self.connection:
-            create_task_log_errors(self.connection.send_json_to_client(message))
+            self.connection.queue_json_to_client(message)
+
+
+def _unique_by_text(cards: Iterable[CardT]) -> List[CardT]:
+    """Return the cards with duplicate texts removed, keeping the first card with each text."""
+    unique = {}
+    for card in cards:
+        unique.setdefault(card.text, card)
+    return list(unique.values())
 
 
 class Deck(Generic[CardT]):
@@ -220,26 +292,15 @@ class Deck(Generic[CardT]):
     def build_white(cls, packs: Sequence[CardPack], blanks: int) -> Deck[WhiteCard]:
         """Build a deck of white cards from the given card packs."""
         deck = cls()
-        seen = set()
-        for pack in packs:
-            for card in pack.white_cards:
-                if card.text not in seen:
-                    deck._discarded.append(card)
-                    seen.add(card.text)
-        for _ in range(blanks):
-            deck._discarded.append(WhiteCard.new_blank())
+        deck._discarded = _unique_by_text(card for pack in packs for card in pack.white_cards)
+        deck._discarded.extend(WhiteCard.new_blank() for _ in range(blanks))
         return deck
 
     @classmethod
     def build_black(cls, packs: Sequence[CardPack]) -> Deck[BlackCard]:
         """Build a deck of black cards from the given card packs."""
         deck = cls()
-        seen = set()
-        for pack in packs:
-            for card in pack.black_cards:
-                if card.text not in seen:
-                    deck._discarded.append(card)
-                    seen.add(card.text)
+        deck._discarded = _unique_by_text(card for pack in packs for card in pack.black_cards)
         return deck
 
     def draw(self, *, discard=False) -> CardT:
@@ -276,20 +337,74 @@ class Deck(Generic[CardT]):
         return len(self._discarded) + len(self._deck)
 
     def reshuffle(self):
-        """Shuffle the discard pile back into the deck."""
-        self._deck.extend(self._discarded)
-        self._discarded.clear()
+        """Shuffle the discard pile back into the deck. Must only be called when the deck is empty."""
+        assert not self._deck, "deck must be empty when reshuffling"
+        # the deck is empty, so just swap the lists instead of copying the cards over
+        self._deck, self._discarded = self._discarded, self._deck
         shuffle(self._deck)
 
 
+@dataclass_slots
 @dataclass
 class Round:
     card_czar: Player
     black_card: BlackCard
-    white_cards: Dict[UserID, Sequence[WhiteCard]] = field(default_factory=dict)
+    # keyed by UserID.int, as ints are much faster to hash than UUIDs
+    white_cards: Dict[int, Sequence[WhiteCard]] = field(default_factory=dict)
     winner: Optional[Player] = None
     id: RoundID = field(default_factory=lambda: RoundID(uuid4()))
-    order_key: bytes = field(default_factory=lambda: urandom(16), init=False)
+    id_str: str = field(init=False, repr=False, compare=False)
+    # maps the slot_id.int of the first card of each played set to the player, for finding the winner
+    _first_card_players: Dict[int, Player] = field(default_factory=dict, init=False, repr=False)
+    # the keys of white_cards in the order returned by randomize_white_cards, or None if not yet decided
+    _display_order: Optional[List[int]] = field(init=False, repr=False)
+    # number of players for which needs_to_play() is true, maintained by count_players_to_play() and friends
+    _players_to_play: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.id_str = str(self.id)
+        self._display_order = None
+        self._players_to_play = 0
+
+    def count_players_to_play(self, players: Iterable[Player]):
+        """Count the players that need to play white cards. Must be called after the cards have been dealt."""
+        self._players_to_play = sum(1 for player in players if self.needs_to_play(player))
+
+    def player_left(self, player: Player):
+        """Stop waiting for ``player`` to play white cards. Must be called before their hand is emptied."""
+        if self.needs_to_play(player):
+            self._players_to_play -= 1
+
+    @property
+    def all_played(self) -> bool:
+        """Check whether every player that needs to play white cards has done so."""
+        return self._players_to_play == 0
+
+    def add_white_cards(self, player: Player, cards: Sequence[WhiteCard]):
+        """Record ``cards`` as played by ``player``, who must need to play."""
+        self._players_to_play -= 1
+        self.white_cards[player.user.id_int] = cards
+        self._first_card_players[cards[0].slot_id.int] = player
+        self._display_order = None
+
+    def remove_white_cards(self, player: Player) -> Sequence[WhiteCard]:
+        """Remove and return the cards played by ``player``.
+
+        :raises KeyError: if the player has not played cards this round.
+        """
+        cards = self.white_cards.pop(player.user.id_int)
+        del self._first_card_players[cards[0].slot_id.int]
+        # keep the order of the remaining cards, so they don't jump around for the Card Czar
+        if self._display_order is not None:
+            self._display_order.remove(player.user.id_int)
+        return cards
+
+    def find_player_by_card(self, slot_id: WhiteCardID) -> Player:
+        """Find the player whose played set starts with the card ``slot_id``.
+
+        :raises KeyError: if no such set was played.
+        """
+        return self._first_card_players[slot_id.int]
 
     def needs_to_play(self, player: Player) -> bool:
         """Check whether ``player`` still needs to play white cards for this round to proceed.
@@ -297,42 +412,49 @@ class Round:
         Returns ``False`` if ``player`` is the Card Czar, if they already played white cards this round or if they
         just joined the game and have no white cards in their hand.
         """
-        return player != self.card_czar and bool(player.hand) and player.id not in self.white_cards
+        return player != self.card_czar and bool(player.hand) and player.user.id_int not in self.white_cards
 
     def randomize_white_cards(self) -> List[Sequence[WhiteCard]]:
-        """Return the values of ``white_cards`` in a random but consistent order dependent on ``order_key``."""
-        # randomize the display order by using md5 as a pseudo-random function
-        display_order = sorted(self.white_cards, key=lambda player_id: md5(self.order_key + player_id.bytes).digest())
-        return [self.white_cards[player_id] for player_id in display_order]
+        """Return the values of ``white_cards`` in a random order.
 
+        The order is shuffled once and then kept consistent until more cards are played.
+        """
+        if self._display_order is None:
+            self._display_order = list(self.white_cards)
+            shuffle(self._display_order)
+        return [self.white_cards[player_id] for player_id in self._display_order]
 
-@dataclass
+
+# each user gets a single Player instance per game, so identity comparison is enough
+@dataclass_slots
+@dataclass(eq=False)
 class Player:
     user: User
-    hand: List[WhiteCard] = field(default_factory=list, init=False)
-    score: int = field(default=0, init=False)
-    idle_rounds: int = field(default=0, init=False)
+    # keyed by slot_id.int, in the order the cards were added
+    hand: Dict[int, WhiteCard] = field(default_factory=dict, init=False)
+    score: int = field(default_factory=int, init=False)
+    idle_rounds: int = field(default_factory=int, init=False)
 
-    pending_updates: Set[UpdateType] = field(default_factory=set, init=False, repr=False)
+    pending_updates: int = field(default_factory=int, init=False, repr=False)
     pending_events: List[dict] = field(default_factory=list, init=False, repr=False)
 
     @property
     def id(self):
         return self.user.id
 
-    def __eq__(self, other):
-        return isinstance(other, Player) and self.user == other.user
+    @property
+    def id_str(self):
+        return self.user.id_str
 
     def play_card(self, card: WhiteCard):
-        for hand_card in self.hand:
-            if hand_card.slot_id == card.slot_id:
-                self.hand.remove(hand_card)
-                return
-        raise InvalidGameState("card_not_in_hand", "you do not have the card")
+        try:
+            del self.hand[card.slot_id.int]
+        except KeyError:
+            raise InvalidGameState("card_not_in_hand", "you do not have the card") from None
 
     def to_event_json(self):
         return {
-            "id": str(self.user.id),
+            "id": self.user.id_str,
             "name": self.user.name,
         }
 
@@ -348,9 +470,16 @@ class Game:
 
     black_deck: Deck[BlackCard]
     white_deck: Deck[WhiteCard]
+    # total number of cards in the hands of all players, to avoid summing them up
+    _cards_in_hands: int = 0
+    # position of the latest card czar in players, moved back when earlier players leave
+    _czar_position: Optional[int] = None
+    # cached result of game_list_json()
+    _list_json: Optional[dict] = None
 
     _round_timer: CallbackTimer
-    _update_handle: Optional[Handle] = None
+    # players with pending updates or events
+    _dirty_players: Set[Player]
 
     def __init__(self, server: GameServer):
         self.code = server.generate_game_code()
@@ -358,6 +487,7 @@ class Game:
         self.options = GameOptions()
         self.rounds = []
         self.players = SearchableList(id=True)
+        self._dirty_players = set()
         self._round_timer = CallbackTimer()
         self._build_decks()
 
@@ -392,6 +522,7 @@ class Game:
 
     def update_options(self, new_options: GameOptions):
         self.options = new_options
+        self._game_list_changed()
         self.send_updates(UpdateType.options)
 
     def add_player(self, user: User):
@@ -401,13 +532,14 @@ class Game:
             raise InvalidGameState("game_full", "the game is full")
         # check that there are enough white cards to distribute
         if self.game_running:
-            total_cards_available = self.white_deck.total_cards() + sum(len(player.hand) for player in self.players)
+            total_cards_available = self.white_deck.total_cards() + self._cards_in_hands
             if total_cards_available < (config.game.hand_size + 2) * (len(self.players) + 1):
                 raise InvalidGameState("too_few_white_cards", "too few white cards in the game for any more players")
         # create the user
         player = Player(user)
         self.players.append(player)
         user.added_to_game(self, player)
+        self._game_list_changed()
         # sync state to players
         self.send_event({
             "type": "player_join",
@@ -428,7 +560,15 @@ class Game:
         # notify the user object while game state is still valid
         player.user.removed_from_game()
         # remove the player now so they won't get further messages
-        self.players.remove(player)
+        position = self.players.index(player)
+        del self.players[position]
+        # if the card czar left, this makes the player after them the next card czar
+        if self._czar_position is not None and position <= self._czar_position:
+            self._czar_position -= 1
+        self._game_list_changed()
+        self._cards_in_hands -= len(player.hand)
+        if self.state == GameState.playing:
+            self.current_round.player_left(player)
         # send updates to the player now to ensure they get notified
         self._send_pending_updates(to=player)
         # nuke the game if no players remain
@@ -458,10 +598,11 @@ class Game:
                 "new_host": self.host.to_event_json(),
             })
         # discard the player's hand
-        self.white_deck.discard_all(player.hand)
+        self.white_deck.discard_all(player.hand.values())
         # discard the player's played cards if round not decided yet
-        if self.state in (GameState.playing, GameState.judging) and player.id in self.current_round.white_cards:
-            played_cards = self.current_round.white_cards.pop(player.id)
+        if self.state in (GameState.playing, GameState.judging) \
+                and player.user.id_int in self.current_round.white_cards:
+            played_cards = self.current_round.remove_white_cards(player)
             self.white_deck.discard_all(played_cards)
             # make sure to sync the played cards if necessary
             self.send_updates(UpdateType.game)
@@ -514,6 +655,8 @@ class Game:
             player.hand.clear()
             player.score = 0
             player.idle_rounds = 0
+        self._cards_in_hands = 0
+        self._czar_position = None
         self.rounds.clear()
         # rebuild decks to minimize any card desyncs
         self._build_decks()
@@ -523,13 +666,11 @@ class Game:
     def _start_next_round(self):
         assert self.state in (GameState.not_started, GameState.round_ended)
         # find a card czar
-        for round_ in reversed(self.rounds):
-            if round_.card_czar in self.players:
-                position = self.players.index(round_.card_czar) + 1
-                card_czar = self.players[position % len(self.players)]
-                break
+        if self._czar_position is None:
+            self._czar_position = randrange(len(self.players))
         else:
-            card_czar = choice(self.players)
+            self._czar_position = (self._czar_position + 1) % len(self.players)
+        card_czar = self.players[self._czar_position]
         # draw a black card
         black_card = self.black_deck.draw(discard=True)
         # start the round
@@ -544,7 +685,10 @@ class Game:
                 target_cards += black_card.draw_count
             # actually draw the cards
             while len(player.hand) < target_cards:
-                player.hand.append(self.white_deck.draw())
+                card = self.white_deck.draw()
+                player.hand[card.slot_id.int] = card
+                self._cards_in_hands += 1
+        round_.count_players_to_play(self.players)
         # start idle timer
         self._set_state(GameState.playing)
         # sync state to players
@@ -553,7 +697,8 @@ class Game:
     def _play_idle_timer(self):
         assert self.state == GameState.playing
         # find anyone that is idling
-        idlers = [player for player in self.players if self.current_round.needs_to_play(player)]
+        round_ = self.current_round
+        idlers = [player for player in self.players if round_.needs_to_play(player)]
         # notify everyone
         self.send_event({
             "type": "players_idle",
@@ -583,29 +728,31 @@ class Game:
     def play_white_cards(self, round_id: RoundID, player: Player, cards: Sequence[Tuple[WhiteCardID, Optional[str]]]):
         if self.state != GameState.playing:
             raise InvalidGameState("invalid_round_state", "white cards are not being played for the round")
-        if round_id != self.current_round.id:
+        round_ = self.current_round
+        if round_id != round_.id:
             raise InvalidGameState("wrong_round", "the round is not being played")
-        if not self.current_round.needs_to_play(player):
+        if not round_.needs_to_play(player):
             raise InvalidGameState("already_played", "you already played white cards for the round")
         # validate the cards
         if len(set(slot_id for slot_id, _ in cards)) != len(cards):
             raise InvalidGameState("invalid_white_cards", "duplicate cards chosen")
-        if len(cards) != self.current_round.black_card.pick_count:
+        if len(cards) != round_.black_card.pick_count:
             raise InvalidGameState("invalid_white_cards", "wrong number of cards chosen")
         # find the cards in the player's hand
         cards_to_play = []
         for slot_id, text in cards:
             try:
-                card = single(card for card in player.hand if card.slot_id == slot_id)
-            except ValueError:
-                raise InvalidGameState("card_not_in_hand", "you do not have the chosen cards")
+                card = player.hand[slot_id.int]
+            except KeyError:
+                raise InvalidGameState("card_not_in_hand", "you do not have the chosen cards") from None
             if text is not None:
                 card = card.write_blank(text)
             cards_to_play.append(card)
         # play the cards from the hand
         for card in cards_to_play:
             player.play_card(card)
-        self.current_round.white_cards[player.id] = cards_to_play
+        self._cards_in_hands -= len(cards_to_play)
+        round_.add_white_cards(player, cards_to_play)
         player.idle_rounds = 0
         # start judging if necessary
         self._check_all_played()
@@ -616,7 +763,7 @@ class Game:
     def _check_all_played(self):
         if self.state != GameState.playing:
             return
-        if not any(self.current_round.needs_to_play(player) for player in self.players):
+        if self.current_round.all_played:
             self._set_state(GameState.judging)
 
     def _judge_idle_timer(self):
@@ -640,11 +787,9 @@ class Game:
             raise InvalidGameState("wrong_round", "the round is not being played")
         # figure out the winner from the winning card
         try:
-            winner_id = single(player for player, cards in self.current_round.white_cards.items()
-                               if cards[0].slot_id == winning_card)
-        except ValueError:
+            winner = self.current_round.find_player_by_card(winning_card)
+        except KeyError:
             raise InvalidGameState("invalid_winner", "no such card played")
-        winner = self.players.find_by("id", winner_id)
         self.card_czar.idle_rounds = 0
         # count the score and start the next round
         self.current_round.winner = winner
@@ -670,8 +815,12 @@ class Game:
             return
         assert self.state in (GameState.playing, GameState.judging)
         # return white cards to hands
-        for player_id, cards in self.current_round.white_cards.items():
-            self.players.find_by("id", player_id).hand.extend(cards)
+        played_cards = self.current_round.white_cards
+        for player in self.players:
+            cards = played_cards.get(player.user.id_int)
+            if cards:
+                player.hand.update((card.slot_id.int, card) for card in cards)
+                self._cards_in_hands += len(cards)
         # start the next round
         self._set_state(GameState.round_ended)
         # sync state to players
@@ -682,83 +831,125 @@ class Game:
 
     def send_updates(self, *kinds: UpdateType, to: Optional[Player] = None, full_resync: bool = False):
         if full_resync:
-            kinds = UpdateType.__members__.values()
-        for player in self._resolve_send_to(to):
-            player.pending_updates.update(kinds)
-        self._send_pending_updates_later()
+            mask = _UPDATE_ALL
+        elif not kinds:
+            return
+        else:
+            mask = 0
+            for kind in kinds:
+                mask |= kind.value
+        recipients = self._resolve_send_to(to)
+        for player in recipients:
+            player.pending_updates |= mask
+        self._dirty_players.update(recipients)
+        self.server.mark_dirty(self)
 
     def send_event(self, event: dict, to: Optional[Player] = None):
         assert "type" in event
-        for player in self._resolve_send_to(to):
+        recipients = self._resolve_send_to(to)
+        for player in recipients:
             player.pending_events.append(event)
-        self._send_pending_updates_later()
-
-    def _send_pending_updates_later(self):
-        if self._update_handle is None:
-            self._update_handle = get_event_loop().call_soon(self._send_pending_updates)
+        self._dirty_players.update(recipients)
+        self.server.mark_dirty(self)
 
     def _send_pending_updates(self, to: Optional[Player] = None):
+        # only go through the players that have something pending
         if to is None:
-            self._update_handle = None
-        for player in self._resolve_send_to(to):
+            recipients, self._dirty_players = self._dirty_players, set()
+        else:
+            self._dirty_players.discard(to)
+            recipients = [to]
+        if not recipients:
+            return
+        # avoid repeatedly evaluating the properties for each player
+        state = self.state
+        current_round = self.current_round
+        game_winner = self.winner
+        round_winner = current_round.winner if current_round else None
+        # the players list, options and judged cards are the same for everyone, so only build them once
+        players_json = None
+        options_json = None
+        judged_cards_json = None
+        for player in recipients:
             to_send = {}
+            pending_updates = player.pending_updates
             # if the player was just removed, just tell them that and move on
             if player not in self.players:
                 to_send["game"] = None
             else:
                 # otherwise, send them the updates that are pending
-                if UpdateType.hand in player.pending_updates:
-                    to_send["hand"] = [card.to_json() for card in player.hand]
-                if UpdateType.game in player.pending_updates:
+                if pending_updates & _UPDATE_HAND:
+                    to_send["hand"] = [card.to_json() for card in player.hand.values()]
+                if pending_updates & _UPDATE_GAME:
                     white_cards = None
-                    if self.state in (GameState.judging, GameState.round_ended):
-                        played_cards = self.current_round.randomize_white_cards()
-                        white_cards = [[card.to_json() for card in play_set] for play_set in played_cards]
-                    elif self.state == GameState.playing and player.id in self.current_round.white_cards:
-                        white_cards = [[card.to_json() for card in self.current_round.white_cards[player.id]]]
+                    if state == GameState.judging or state == GameState.round_ended:
+                        if judged_cards_json is None:
+                            judged_cards_json = [[card.to_json() for card in play_set]
+                                                 for play_set in current_round.randomize_white_cards()]
+                        white_cards = judged_cards_json
+                    elif state == GameState.playing and player.user.id_int in current_round.white_cards:
+                        white_cards = [[card.to_json() for card in current_round.white_cards[player.user.id_int]]]
                     to_send["game"] = {
                         "code": self.code,
-                        "state": self.state.name,
+                        "state": state.name,
                         "current_round": {
-                            "id": str(self.current_round.id),
-                            "black_card": self.current_round.black_card.to_json(),
+                            "id": current_round.id_str,
+                            "black_card": current_round.black_card.to_json(),
                             "white_cards": white_cards,
-                            "card_czar": str(self.current_round.card_czar.id),
+                            "card_czar": current_round.card_czar.id_str,
                             "winner": {
-                                "player": str(self.current_round.winner.id),
-                                "cards": str(self.current_round.white_cards[self.current_round.winner.id][0].slot_id),
-                            } if self.current_round.winner else None
-                        } if self.current_round else None,
-                        "winner": str(self.winner.id) if self.winner else None,
+                                "player": round_winner.id_str,
+                                "cards": current_round.white_cards[round_winner.user.id_int][0].slot_id_str,
+                            } if round_winner else None
+                        } if current_round else None,
+                        "winner": game_winner.id_str if game_winner else None,
                     }
-                if UpdateType.players in player.pending_updates:
-                    to_send["players"] = [{
-                        "id": str(player.id),
-                        "name": player.user.name,
-                        "score": player.score,
-                        "playing": self.state == GameState.playing and self.current_round.needs_to_play(player),
-                    } for player in self.players]
-                if UpdateType.options in player.pending_updates:
-                    to_send["options"] = self.options.to_json()
+                if pending_updates & _UPDATE_PLAYERS:
+                    if players_json is None:
+                        players_json = self._players_json()
+                    to_send["players"] = players_json
+                if pending_updates & _UPDATE_OPTIONS:
+                    if options_json is None:
+                        options_json = self.options.to_json()
+                    to_send["options"] = options_json
             # always send pending events
             if player.pending_events:
                 to_send["events"] = player.pending_events[:]
-            player.pending_updates.clear()
+            player.pending_updates = 0
             player.pending_events.clear()
             if to_send:
                 player.user.send_message(to_send)
 
+    def _players_json(self):
+        playing_round = self.current_round if self.state == GameState.playing else None
+        return [{
+            "id": player.id_str,
+            "name": player.user.name,
+            "score": player.score,
+            "playing": playing_round is not None and playing_round.needs_to_play(player),
+        } for player in self.players]
+
+    def _game_list_changed(self):
+        self._list_json = None
+        self.server.game_list_changed()
+
     def game_list_json(self):
-        title = self.options.game_title.strip()
-        if not title:
-            title = config.game.title.default.replace("{USER}", self.host.user.name)
-        return {
-            "code": str(self.code),
-            "title": title,
-            "players": len(self.players),
-            "player_limit": self.options.player_limit,
-            "passworded": bool(self.options.password)
-        }
+        """Get the entry for this game in the game list.
+
+        The result is cached until the options or players change. It must not be modified.
+        """
+        if self._list_json is None:
+            title = self.options.game_title.strip()
+            if not title:
+                title = config.game.title.default.replace("{USER}", self.host.user.name)
+            self._list_json = {
+                "code": self.code,
+                "title": title,
+                "players": len(self.players),
+                "player_limit": self.options.player_limit,
+                "passworded": bool(self.options.password)
+            }
+        return self._list_json
 
 
 class GameServer:
@@ -766,37 +957,74 @@ class GameServer:
     users: SearchableList[User]
     card_packs: SearchableList[CardPack]
 
+    _config_json: Optional[dict] = None
+    _serialized_handshake_json: Optional[str] = None
+    _game_list_json: Optional[list] = None
+
+    # games with pending updates, all sent by a single callback on the next loop iteration
+    _dirty_games: Set[Game]
+    _flush_handle: Optional[Handle] = None
+
     def __init__(self):
         self.games = SearchableList(code=IndexType.NOT_NONE)
-        self.users = SearchableList(id=IndexType.NOT_NONE, name=lambda user: user.name.lower())
+        self.users = SearchableList(id=IndexType.NOT_NONE, name=lambda user: user.name_lower)
         self.card_packs = SearchableList(id=IndexType.NOT_NONE)
+        self._dirty_games = set()
 
     def load_local_packs(self):
-        db_pack: DbCardPack
-        db_white: DbWhiteCard
-        db_black: DbBlackCard
         with db_connection.connection_context():
-            for db_pack in DbCardPack.select():
-                white_cards = []
-                for db_white in db_pack.white_cards:
-                    white_cards.append(WhiteCard(slot_id=db_white.uuid, text=db_white.text, pack_name=db_pack.name))
-                black_cards = []
-                for db_black in db_pack.black_cards:
-                    black_cards.append(BlackCard(text=db_black.text, draw_count=db_black.draw_count,
-                                                 pick_count=db_black.pick_count, pack_name=db_pack.name))
-                pack = CardPack(id=db_pack.uuid, name=db_pack.name, white_cards=frozenset(white_cards),
-                                black_cards=frozenset(black_cards))
-                self.card_packs.append(pack)
+            # fetch plain tuples instead of model instances, and all cards at once instead of one query per pack
+            white_rows = defaultdict(list)
+            for pack_id, *row in DbWhiteCard.select(DbWhiteCard.pack, DbWhiteCard.uuid, DbWhiteCard.text).tuples():
+                white_rows[pack_id].append(row)
+            black_rows = defaultdict(list)
+            for pack_id, *row in DbBlackCard.select(DbBlackCard.pack, DbBlackCard.text, DbBlackCard.pick_count,
+                                                    DbBlackCard.draw_count).tuples():
+                black_rows[pack_id].append(row)
+            db_packs = DbCardPack.select(DbCardPack.id, DbCardPack.uuid, DbCardPack.name).tuples()
+            self.card_packs.extend(self._load_local_pack(uuid, name, white_rows[pack_id], black_rows[pack_id])
+                                   for pack_id, uuid, name in db_packs)
+        self._config_json = None
+        self._serialized_handshake_json = None
+
+    @staticmethod
+    def _load_local_pack(uuid: CardPackID, pack_name: str, white_rows: Iterable[tuple],
+                         black_rows: Iterable[tuple]) -> CardPack:
+        # the cards are unique in the database, and decks deduplicate them anyway, so a set isn't needed.
+        # many packs contain the same cards, so intern the texts to share memory and speed up deduplication
+        white_cards = tuple(WhiteCard(slot_id=slot_id, text=intern(text), pack_name=pack_name)
+                            for slot_id, text in white_rows)
+        black_cards = tuple(BlackCard(text=intern(text), pick_count=pick_count, draw_count=draw_count,
+                                      pack_name=pack_name)
+                            for text, pick_count, draw_count in black_rows)
+        return CardPack(id=uuid, name=pack_name, white_cards=white_cards, black_cards=black_cards)
 
     def config_json(self):
-        return {
-            **config.to_json(),
-            "card_packs": [pack.to_json() for pack in self.card_packs]
-        }
+        """Get the configuration sent to clients.
+
+        The result is cached, as the config and card packs don't change while the server runs. It must not be modified.
+        """
+        if self._config_json is None:
+            self._config_json = {
+                **config.to_json(),
+                "card_packs": [pack.to_json() for pack in self.card_packs]
+            }
+        return self._config_json
+
+    def serialized_handshake_json(self) -> str:
+        """Get the handshake response, containing ``config_json()``, serialized as JSON.
+
+        The result is cached like ``config_json()``.
+        """
+        if self._serialized_handshake_json is None:
+            self._serialized_handshake_json = orjson.dumps({"config": self.config_json()}).decode()
+        return self._serialized_handshake_json
 
     def generate_game_code(self) -> GameCode:
+        characters = config.game.code.characters
+        length = config.game.code.length
         while True:
-            attempt = GameCode(generate_code(config.game.code.characters, config.game.code.length))
+            attempt = GameCode(generate_code(characters, length))
             if self.games.exists("code", attempt):
                 continue
             return attempt
@@ -805,12 +1033,40 @@ class GameServer:
         self.users.append(user)
 
     def remove_user(self, user: User, reason: LeaveReason):
-        if user.game:
+        if user.game is not None:
             user.game.remove_player(user.player, reason)
         self.users.remove(user)
 
     def add_game(self, game: Game):
         self.games.append(game)
+        self.game_list_changed()
 
     def remove_game(self, game: Game):
         self.games.remove(game)
+        self.game_list_changed()
+
+    def game_list_changed(self):
+        """Invalidate the cached game list. Called when games are added or removed or their list entries change."""
+        self._game_list_json = None
+
+    def game_list_json(self) -> list:
+        """Get the list of public games.
+
+        The result is cached until ``game_list_changed()`` is called. It must not be modified.
+        """
+        if self._game_list_json is None:
+            self._game_list_json = [game.game_list_json() for game in self.games if game.options.public]
+        return self._game_list_json
+
+    def mark_dirty(self, game: Game):
+        """Schedule the pending updates of ``game`` to be sent on the next event loop iteration."""
+        self._dirty_games.add(game)
+        if self._flush_handle is None:
+            self._flush_handle = get_event_loop().call_soon(self._flush_dirty_games)
+
+    def _flush_dirty_games(self):
+        self._flush_handle = None
+        # swap the set first, in case sending updates marks more games dirty
+        dirty_games, self._dirty_games = self._dirty_games, set()
+        for game in dirty_games:
+            game._send_pending_updates()
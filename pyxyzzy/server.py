@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import json
 from abc import ABC, abstractmethod
 from asyncio import get_event_loop
 from asyncio.futures import Future
+from collections import deque
 from dataclasses import fields, replace
 from functools import wraps
-from json import JSONDecodeError
+from hmac import compare_digest
 from logging import getLogger
-from typing import Optional, Tuple, List, Callable, Union
+from typing import Optional, Tuple, List, Callable, Union, Deque, Dict
 from uuid import UUID
 
+import orjson
 from websockets import WebSocketServerProtocol, ConnectionClosed, serve
 
 from pyxyzzy import UI_VERSION
@@ -25,6 +26,9 @@ from pyxyzzy.utils.config import ConfigError
 
 LOGGER = getLogger(__name__)
 
+# the option names in declaration order, so that errors are reported consistently
+GAME_OPTION_NAMES = tuple(field.name for field in fields(GameOptions))
+
 
 def require_not_ingame(method):
     @wraps(method)
@@ -84,22 +88,35 @@ async def run_server(stop_condition: Future):
         from pyxyzzy.test.bot import run_bots
         create_task_log_errors(run_bots(game_server, stop_condition))
 
-    async with serve(connection_factory(game_server), config.server.host, config.server.port):
+    async with serve(connection_factory(game_server), config.server.host, config.server.port,
+                     max_size=config.server.max_message_size,
+                     compression="deflate" if config.server.compression else None):
         await stop_condition
 
 
 class GameConnection(ABC):
+    # handlers may return a dict of extra response fields; it must be a new dict, as it will be modified
     handlers: FunctionRegistry[ApiAction, Callable[[GameConnection, dict], Optional[dict]]] = FunctionRegistry()
+    handlers_by_name: Dict[str, Tuple[ApiAction, Callable[[GameConnection, dict], Optional[dict]]]]
 
     remote_addr: str
 
-    handshaked: bool = False
-    user: Optional[User] = None
+    handshaked: bool
+    user: Optional[User]
     server: GameServer
 
+    _send_queue: Deque[dict]
+    _sending: bool
+
+    __slots__ = ("remote_addr", "handshaked", "user", "server", "_send_queue", "_sending")
+
     def __init__(self, server: GameServer, remote_addr: str):
         self.server = server
         self.remote_addr = remote_addr
+        self.handshaked = False
+        self.user = None
+        self._send_queue = deque()
+        self._sending = False
 
     def client_disconnected(self):
         """Called by subclasses when the client has disconnected."""
@@ -117,23 +134,51 @@ class GameConnection(ABC):
     async def send_json_to_client(self, data: dict, *, close: bool = False):
         """Sends a JSON message to the client."""
 
+    def queue_json_to_client(self, data: dict):
+        """Sends a JSON message to the client in the background.
+
+        Queued messages are sent in order by a single task, which is only started if one isn't already running.
+        """
+        self._send_queue.append(data)
+        if not self._sending:
+            self._sending = True
+            create_task_log_errors(self._send_queued())
+
+    async def _send_queued(self):
+        try:
+            while self._send_queue:
+                await self.send_json_to_client(self._send_queue.popleft())
+        finally:
+            self._sending = False
+
+    async def send_serialized_json_to_client(self, data: str, *, close: bool = False):
+        """Sends an already serialized JSON message to the client.
+
+        The default implementation parses the message and passes it to ``send_json_to_client``. Subclasses that
+        serialize messages should override this to send the message as-is.
+        """
+        await self.send_json_to_client(orjson.loads(data), close=close)
+
     async def receive_json_from_client(self, message: Union[str, bytes]):
         """Called by subclasses when they receive a JSON message from the client."""
         if not isinstance(message, str):
             raise InvalidRequest("only text JSON messages allowed")
         try:
-            parsed = json.loads(message)
-        except JSONDecodeError:
+            parsed = orjson.loads(message)
+        except orjson.JSONDecodeError:
             raise InvalidRequest("invalid JSON")
+        await self.receive_dict_from_client(parsed)
+
+    async def receive_dict_from_client(self, parsed: dict):
+        """Called by subclasses when they receive an already parsed message from the client."""
         if not isinstance(parsed, dict):
             raise InvalidRequest("only JSON objects allowed")
 
         if not self.handshaked:
             try:
                 if parsed["version"] == UI_VERSION:
-                    await self.send_json_to_client({
-                        "config": self.server.config_json()
-                    })
+                    # the config is the same for everyone, so it is serialized only once
+                    await self.send_serialized_json_to_client(self.server.serialized_handshake_json())
                     self.handshaked = True
                 else:
                     await self.send_json_to_client({
@@ -143,35 +188,35 @@ class GameConnection(ABC):
             except KeyError:
                 raise InvalidRequest("invalid handshake")
 
-        try:
-            action = ApiAction[parsed["action"]]
-            call_id = parsed["call_id"]
-        except KeyError:
-            raise InvalidRequest("action or call_id missing or invalid")
-        if not isinstance(action, ApiAction) or not isinstance(call_id, (str, int, float)):
+        action = parsed.get("action")
+        call_id = parsed.get("call_id")
+        entry = self.handlers_by_name.get(action) if isinstance(action, str) else None
+        if entry is None or not isinstance(call_id, (str, int, float)):
             raise InvalidRequest("action or call_id missing or invalid")
+        action, handler = entry
 
-        result = self._handle_request(action, call_id, parsed)
+        result = self._handle_request(action, handler, call_id, parsed)
 
         await self.send_json_to_client(result)
 
-    def _handle_request(self, action: ApiAction, call_id: Union[str, int, float], content: dict):
+    def _handle_request(self, action: ApiAction, handler: Callable[[GameConnection, dict], Optional[dict]],
+                        call_id: Union[str, int, float], content: dict):
         # noinspection PyBroadException
         try:
-            if not self.user and action != ApiAction.authenticate:
+            if not self.user and action is not ApiAction.authenticate:
                 raise GameError("not_authenticated", "must authenticate first")
 
-            try:
-                handler = self.handlers[action]
-            except KeyError:
-                raise InvalidRequest("invalid action")
-
-            call_result = handler(self, content) or {}
-            return {
-                "call_id": call_id,
-                "error": None,
-                **call_result
-            }
+            call_result = handler(self, content)
+            # most actions return nothing, so don't bother merging
+            if not call_result:
+                return {
+                    "call_id": call_id,
+                    "error": None,
+                }
+            # handlers return a new dict each time, so it can be reused as the response
+            call_result["call_id"] = call_id
+            call_result["error"] = None
+            return call_result
         except GameError as ex:
             # force a full resync if that will likely be useful
             if isinstance(ex, InvalidGameState) and self.user and self.user.game:
@@ -203,7 +248,11 @@ class GameConnection(ABC):
                 user = self.server.users.find_by("id", user_id)
             except KeyError:
                 raise GameError("user_not_found", "user not found")
-            if user.token != content["token"]:
+            token = content["token"]
+            if not isinstance(token, str):
+                raise InvalidRequest("invalid token")
+            # compare in constant time to avoid leaking the token through timing
+            if not compare_digest(user.token.encode(), token.encode()):
                 raise GameError("invalid_token", "invalid token")
             self.user = user
             self.user.reconnected(self)
@@ -221,7 +270,7 @@ class GameConnection(ABC):
 
         LOGGER.info("%s authenticated as %s", self.remote_addr, self.user)
         result = {
-            "id": str(user.id),
+            "id": user.id_str,
             "token": user.token,
             "name": user.name,
             "in_game": user.game is not None
@@ -238,7 +287,7 @@ class GameConnection(ABC):
     @handlers.register(ApiAction.game_list)
     def _handle_game_list(self, _: dict):
         return {
-            "games": [game.game_list_json() for game in self.server.games if game.options.public]
+            "games": self.server.game_list_json()
         }
 
     @handlers.register(ApiAction.create_game)
@@ -266,7 +315,10 @@ class GameConnection(ABC):
             password = content.get("password", "")
             if not password:
                 raise GameError("password_required", "a password is required to join the game")
-            if game.options.password.upper() != password.upper():
+            if not isinstance(password, str):
+                raise InvalidRequest("invalid password")
+            # compare in constant time to avoid leaking the password through timing
+            if not compare_digest(game.options.password.upper().encode(), password.upper().encode()):
                 raise GameError("password_incorrect", "incorrect password")
 
         game.add_player(self.user)
@@ -286,31 +338,42 @@ class GameConnection(ABC):
 
         if user_id == self.user.id:
             raise InvalidGameState("self_kick", "can't kick yourself")
+        game = self.user.game
         try:
-            player = self.user.game.players.find_by("id", user_id)
+            player = game.players.find_by("id", user_id)
         except KeyError:
             raise InvalidGameState("player_not_in_game", "the player is not in the game")
 
-        self.user.game.remove_player(player, LeaveReason.host_kick)
+        game.remove_player(player, LeaveReason.host_kick)
 
     @handlers.register(ApiAction.game_options)
     @require_host
     def _handle_game_options(self, content: dict):
         changes = {}
-        for field in fields(GameOptions):
-            if field.name in content:
-                if self.user.game.game_running and field.name not in GameOptions.updateable_ingame:
-                    raise InvalidGameState("option_locked", f"{field.name} can't be changed while the game is ongoing")
-                value = content[field.name]
-                if field.name == "card_packs":
+        game = self.user.game
+        options = game.options
+        game_running = game.game_running
+        for name in GAME_OPTION_NAMES:
+            if name in content:
+                if game_running and name not in GameOptions.updateable_ingame:
+                    raise InvalidGameState("option_locked", f"{name} can't be changed while the game is ongoing")
+                value = content[name]
+                if name == "card_packs":
                     try:
                         value = tuple(self.server.card_packs.find_by("id", CardPackID(UUID(uuid))) for uuid in value)
                     except (TypeError, ValueError, KeyError):
                         raise InvalidRequest("invalid card_packs list")
-                changes[field.name] = value
+                # skip values that are unchanged, but leave mistyped values for validation to reject
+                current_value = getattr(options, name)
+                if type(value) is type(current_value) and value == current_value:
+                    continue
+                changes[name] = value
+        # avoid creating and broadcasting identical options
+        if not changes:
+            return
         try:
-            new_options = replace(self.user.game.options, **changes)
-            self.user.game.update_options(new_options)
+            new_options = replace(options, **changes)
+            game.update_options(new_options)
         except ConfigError as ex:
             raise GameError("invalid_options", str(ex)) from None
 
@@ -334,16 +397,21 @@ class GameConnection(ABC):
             raise InvalidRequest("invalid round")
         try:
             input_cards = content["cards"]
+            if not isinstance(input_cards, list):
+                raise InvalidRequest("invalid cards")
             for input_card in input_cards:
                 if not isinstance(input_card, dict):
                     raise InvalidRequest("invalid cards")
                 slot_id = WhiteCardID(UUID(hex=input_card["id"]))
                 text = input_card.get("text")
                 if text is not None:
-                    if not (isinstance(text, str) and config.game.blank_cards.is_valid_text(text)):
-                        # TODO graceful handling for disallowed text
+                    if not isinstance(text, str):
                         raise InvalidRequest("invalid cards")
+                    # strip first, so is_valid_text() doesn't need to copy the text again
                     text = text.strip()
+                    if not config.game.blank_cards.is_valid_text(text):
+                        # TODO graceful handling for disallowed text
+                        raise InvalidRequest("invalid cards")
                 cards.append((slot_id, text))
         except (KeyError, ValueError):
             raise InvalidRequest("invalid cards")
@@ -383,9 +451,16 @@ class GameConnection(ABC):
         })
 
 
+# maps action names directly to the actions and their handlers, to skip the enum lookup for each message
+GameConnection.handlers_by_name = {action.name: (action, handler)
+                                   for action, handler in GameConnection.handlers.items()}
+
+
 class WebSocketGameConnection(GameConnection):
     websocket: WebSocketServerProtocol
 
+    __slots__ = ("websocket",)
+
     def __init__(self, websocket: WebSocketServerProtocol, server: GameServer):
         GameConnection.__init__(self, server, str(websocket.remote_address))
         self.websocket = websocket
@@ -405,7 +480,19 @@ class WebSocketGameConnection(GameConnection):
             self.client_disconnected()
 
     async def send_json_to_client(self, data: dict, *, close: bool = False):
-        if self.websocket.open:
-            await self.websocket.send(json.dumps(data))
+        # don't bother serializing messages that can't be sent
+        if not self.websocket.open:
+            return
+        # orjson produces bytes, but the client expects text frames
+        await self.send_serialized_json_to_client(orjson.dumps(data).decode(), close=close)
+
+    async def send_serialized_json_to_client(self, data: str, *, close: bool = False):
+        if not self.websocket.open:
+            return
+        try:
+            await self.websocket.send(data)
             if close:
                 await self.websocket.close()
+        except ConnectionClosed:
+            # the connection closed while sending, handler() takes care of the cleanup
+            pass
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 from abc import ABC, abstractmethod
 from asyncio import Task, Queue, Future, sleep, shield
 from asyncio.events import get_event_loop
@@ -9,6 +8,7 @@ from logging import getLogger
 from random import randint, choice, sample, Random
 from typing import Dict, Callable, Optional, Tuple, Awaitable, List, Set
 
+import orjson
 from websockets import WebSocketClientProtocol, connect, ConnectionClosed
 
 from pyxyzzy import UI_VERSION
@@ -140,7 +140,7 @@ class DirectBotConnection(GameConnection, BotConnection):
     async def _send_dispatcher(self):
         while True:
             message = await self.send_queue.get()
-            await self.receive_json_from_client(json.dumps(message))
+            await self.receive_dict_from_client(message)
 
     async def _recv_dispatcher(self):
         while True:
@@ -163,11 +163,17 @@ class DirectBotConnection(GameConnection, BotConnection):
         self.client_disconnected()
         await super().close()
 
+    # messages are passed to the bot by reference and may contain the server's cached dicts (card JSON, the game list,
+    # the config), so bots must treat everything they receive as read-only
     async def send_json_to_client(self, data: dict, *, close: bool = False):
         self.recv_queue.put_nowait(data)
         if close:
             await self.close()
 
+    def queue_json_to_client(self, data: dict):
+        # putting into the queue never blocks, so skip the sender task
+        self.recv_queue.put_nowait(data)
+
 
 class WebSocketBotConnection(BotConnection):
     """A connection that uses a real websocket for connecting to the server."""
@@ -180,16 +186,17 @@ class WebSocketBotConnection(BotConnection):
         self.url = url
 
     async def send_json_to_server(self, data: dict):
-        await self.connection.send(json.dumps(data))
+        # the server only accepts text frames
+        await self.connection.send(orjson.dumps(data).decode())
 
     async def open(self):
         self.connection = await connect(self.url)
         self.local_addr = str(self.connection.local_address)
         # perform handshake
-        await self.connection.send({
+        await self.connection.send(orjson.dumps({
             "version": UI_VERSION
-        })
-        config_response = json.loads(await self.connection.recv())
+        }).decode())
+        config_response = orjson.loads(await self.connection.recv())
         assert "config" in config_response, "connection handshake failed"
         self.server_config = config_response["config"]
         # continue with connection
@@ -199,7 +206,7 @@ class WebSocketBotConnection(BotConnection):
     async def _recv_dispatcher(self):
         try:
             async for message in self.connection:
-                self.receive_json_from_server(json.loads(message))
+                self.receive_json_from_server(orjson.loads(message))
         except ConnectionClosed:
             self.closed()
 
@@ -1,4 +1,5 @@
 from asyncio import Task, create_task, sleep, CancelledError
+from dataclasses import fields, MISSING
 from logging import getLogger
 from random import choices
 from sys import flags
@@ -58,6 +59,31 @@ class FunctionRegistry(Dict[K, V]):
         return _decorator
 
 
+def dataclass_slots(cls: T) -> T:
+    """Recreates a dataclass with ``__slots__`` for all of its fields.
+
+    Equivalent to ``dataclass(slots=True)`` on Python 3.10+. Must be applied on top of the ``dataclass`` decorator.
+    Note that the class is recreated, so methods using ``super()`` without arguments will not work.
+
+    Fields with ``init=False`` can't have a plain ``default``, as ``dataclass`` implements those using class attributes.
+    Leave them unset (reading them raises ``AttributeError``) or use ``default_factory`` instead.
+    """
+    for field in fields(cls):
+        if not field.init and field.default is not MISSING:
+            raise TypeError(f"field {field.name} can't have init=False and a default with slots")
+    cls_dict = dict(cls.__dict__)
+    field_names = tuple(field.name for field in fields(cls))
+    cls_dict["__slots__"] = field_names
+    # remove the default values that would conflict with the slots; __init__ already has them as defaults
+    for name in field_names:
+        cls_dict.pop(name, None)
+    cls_dict.pop("__dict__", None)
+    cls_dict.pop("__weakref__", None)
+    new_cls = type(cls)(cls.__name__, cls.__bases__, cls_dict)
+    new_cls.__qualname__ = cls.__qualname__
+    return new_cls
+
+
 def generate_code(alphabet, length):
     """Generates a code from the given alphabet."""
     return "".join(choices(alphabet, k=length))
@@ -52,7 +52,16 @@ def _stringify_type(type_or_types):
             return str(type_or_types)
 
 
-def _validate_field_type(name, type_, value):
+def _skip_validation(_name, _value):
+    pass
+
+
+def _compile_type_validator(type_):
+    """Create a function that validates values against ``type_``.
+
+    The returned function takes the field name and value and raises ``ConfigError`` if the value doesn't match the
+    type. All inspection of the type is done here, so that validating a value only needs to run the checks.
+    """
     # get the origin type for generic aliases
     try:
         origin = type_.__origin__
@@ -61,41 +70,63 @@ def _validate_field_type(name, type_, value):
 
     # handle unions specially
     if origin == Union:
-        for option in type_.__args__:
-            try:
-                _validate_field_type(name, option, value)
-                return
-            except ConfigError:
-                pass
-        raise ConfigError(name, f"%s must be {_stringify_type(type_.__args__)}, not {type(value).__name__}")
+        option_validators = [_compile_type_validator(option) for option in type_.__args__]
+        message = f"%s must be {_stringify_type(type_.__args__)}, not {{}}"
+
+        def validate_union(name, value):
+            for validator in option_validators:
+                try:
+                    validator(name, value)
+                    return
+                except ConfigError:
+                    pass
+            raise ConfigError(name, message.format(type(value).__name__))
+        return validate_union
 
     if not isinstance(origin, type):
         # ignore any weird generic aliases
-        return
-    if not isinstance(value, origin):
-        raise ConfigError(name, f"%s must be {origin.__name__}, not {type(value).__name__}")
+        return _skip_validation
+    message = f"%s must be {origin.__name__}, not {{}}"
+
+    def validate_type(name, value):
+        if not isinstance(value, origin):
+            raise ConfigError(name, message.format(type(value).__name__))
 
     # try to validate items for generic iterables
     try:
         args = type_.__args__
     except AttributeError:
-        return
+        return validate_type
     if issubclass(origin, abc.Sequence):
-        value: abc.Sequence
         (item_type, ) = args
-        for index, item in enumerate(value):
-            _validate_field_type(f"{name}[{index}]", item_type, item)
+        validate_item = _compile_type_validator(item_type)
+
+        def validate_sequence(name, value: abc.Sequence):
+            validate_type(name, value)
+            for index, item in enumerate(value):
+                validate_item(f"{name}[{index}]", item)
+        return validate_sequence
     elif issubclass(origin, abc.Mapping):
-        value: abc.Mapping
         key_type, value_type = args
-        for key, item in value.items():
-            _validate_field_type(f"{name} keys", key_type, key)
-            _validate_field_type(f"{name}[{key}]", value_type, item)
+        validate_key = _compile_type_validator(key_type)
+        validate_value = _compile_type_validator(value_type)
+
+        def validate_mapping(name, value: abc.Mapping):
+            validate_type(name, value)
+            for key, item in value.items():
+                validate_key(f"{name} keys", key)
+                validate_value(f"{name}[{key}]", item)
+        return validate_mapping
     elif issubclass(origin, abc.Iterable):
-        value: abc.Iterable
         (item_type, ) = args
-        for index, item in enumerate(value):
-            _validate_field_type(f"{name} items", item_type, item)
+        validate_item = _compile_type_validator(item_type)
+
+        def validate_iterable(name, value: abc.Iterable):
+            validate_type(name, value)
+            for item in value:
+                validate_item(f"{name} items", item)
+        return validate_iterable
+    return validate_type
 
 
 @dataclass(frozen=True)
@@ -161,20 +192,31 @@ class ConfigObject:
         # allow omitting the boilerplate @dataclass in subclasses
         dataclass(cls, frozen=True)
 
-    def __post_init__(self):
+    @classmethod
+    def _get_field_validators(cls):
+        """Get the fields to validate, along with a compiled type validator for each.
+
+        This is computed once per class on first use, as the type hints can't always be evaluated at class creation.
+        """
+        try:
+            return cls.__dict__["_field_validators"]
+        except KeyError:
+            pass
         # Field.type can contain strings; get_type_hints evaluates them
-        field_types = get_type_hints(self.__class__)
-        field: Field
-        for field in fields(self):
-            # don't validate non-initialized fields
-            if not field.init:
-                continue
+        field_types = get_type_hints(cls)
+        # don't validate non-initialized fields
+        validators = tuple((field, _compile_type_validator(field_types[field.name]))
+                           for field in fields(cls) if field.init)
+        cls._field_validators = validators
+        return validators
 
+    def __post_init__(self):
+        field: Field
+        for field, validate_type in self._get_field_validators():
             value = getattr(self, field.name)
-            field_type = field_types[field.name]
 
             # always validate the type
-            _validate_field_type(field.name, field_type, value)
+            validate_type(field.name, value)
 
             # use explicit validate method if it exists
             try:
@@ -97,11 +97,10 @@ class SearchableList(MutableSequence[T]):
         :raises ValueError: if there is no index for the given attribute.
         """
         try:
-            self.find_by(by, key)
+            index = self.__indices[by]
         except KeyError:
-            return False
-        else:
-            return True
+            raise ValueError(f"no index called {by}") from None
+        return key in index.data
 
     def remove_by(self, by: str, key: Hashable) -> T:
         """Remove and return the item whose ``attr`` is equal to ``key``.
@@ -113,6 +112,12 @@ class SearchableList(MutableSequence[T]):
         self.remove(item)
         return item
 
+    def remove(self, item: T) -> None:
+        # override: avoid the generic MutableSequence implementation that goes through index() and __delitem__()
+        pos = self.__data.index(item)
+        self.__drop_from_index(self.__data[pos])
+        del self.__data[pos]
+
     def __iter__(self):
         return iter(self.__data)
 